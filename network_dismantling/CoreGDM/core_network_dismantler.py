@@ -18,7 +18,6 @@
 import logging
 from copy import deepcopy
 from datetime import timedelta
-from operator import itemgetter
 from time import time
 from typing import Union
 
@@ -325,10 +324,10 @@ def test(args, model, early_stopping_dict: dict = None, networks_provider=None,
 
         best_dismantling = removals[-1]
 
-        r_auc = simpson(list(r[3] for r in removals), dx=1)
-        rem_num = best_dismantling[0]
+        r_auc = simpson(removals["lcc_size"], dx=1)
+        rem_num = int(best_dismantling["removal_num"])
         # rem_num = len(removals)
-        min_lcc_size = best_dismantling[3]
+        min_lcc_size = float(best_dismantling["lcc_size"])
 
         if 0 <= min_lcc_size <= stop_condition:
             # logger.debug("UPDATING EARLY STOPPING VALUES")
@@ -342,15 +341,15 @@ def test(args, model, early_stopping_dict: dict = None, networks_provider=None,
                 "rem_num": min(default_value["rem_num"], rem_num),
             }
 
-        peak_slcc = max(removals, key=itemgetter(4))
+        peak_slcc = removals[removals["slcc_size"].argmax()]
 
         run = {
             "network": filename,
 
-            "removals": removals if rem_num > 0 else [],
-            "slcc_peak_at": peak_slcc[0] if rem_num > 0 else np.inf,
-            "lcc_size_at_peak": peak_slcc[3] if rem_num > 0 else np.inf,
-            "slcc_size_at_peak": peak_slcc[4] if rem_num > 0 else np.inf,
+            "removals": removals.tolist() if rem_num > 0 else [],
+            "slcc_peak_at": int(peak_slcc["removal_num"]) if rem_num > 0 else np.inf,
+            "lcc_size_at_peak": float(peak_slcc["lcc_size"]) if rem_num > 0 else np.inf,
+            "slcc_size_at_peak": float(peak_slcc["slcc_size"]) if rem_num > 0 else np.inf,
 
             "r_auc": r_auc if rem_num > 0 else np.inf,
             "rem_num": rem_num if rem_num > 0 else np.inf,
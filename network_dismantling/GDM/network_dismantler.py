@@ -19,7 +19,6 @@
 import argparse
 import logging
 from copy import deepcopy
-from operator import itemgetter
 from pathlib import Path
 from random import seed
 
@@ -207,18 +206,18 @@ def test(args, model, networks_provider, print_model=True, logger=logging.getLog
 
             removals, prediction_time, dismantle_time, _ = dismantler(network, predictor, generator_args, stop_condition)
 
-            peak_slcc = max(removals, key=itemgetter(4))
+            peak_slcc = removals[removals["slcc_size"].argmax()]
 
             run = {
                 "network": filename,
 
-                "removals": removals,
+                "removals": removals.tolist(),
 
-                "slcc_peak_at": peak_slcc[0],
-                "lcc_size_at_peak": peak_slcc[3],
-                "slcc_size_at_peak": peak_slcc[4],
+                "slcc_peak_at": int(peak_slcc["removal_num"]),
+                "lcc_size_at_peak": float(peak_slcc["lcc_size"]),
+                "slcc_size_at_peak": float(peak_slcc["slcc_size"]),
 
-                "r_auc": simpson(list(r[3] for r in removals), dx=1),
+                "r_auc": simpson(removals["lcc_size"], dx=1),
                 "rem_num": len(removals),
 
                 "prediction_time": prediction_time,
@@ -425,6 +425,8 @@ method_info = dict(
     citation=None,
     authors=None,
     source="https://github.com/NetworkScienceLab/GDM/",
+    # The grid search drives the pool itself: run in the parent process
+    uses_executor=True,
     # plot_color=None,
     # plot_marker=None,
 )
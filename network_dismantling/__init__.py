@@ -55,6 +55,11 @@ class DismantlingMethod:
     function = None
     dynamic = None
 
+    # The method fans tasks out to the process pool itself (e.g., the GDM
+    # grid search), so it must run in the parent process and cannot be
+    # submitted to the pool as a task of its own
+    uses_executor: bool = False
+
     display_name: str = None
     short_display_name: str = None
 
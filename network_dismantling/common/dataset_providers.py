@@ -1,4 +1,5 @@
 import logging
+import tempfile
 from glob import glob
 from pathlib import Path
 from typing import Union, List
@@ -6,6 +7,79 @@ from typing import Union, List
 from network_dismantling.common.loaders import load_graph
 
 
+class SharedNetworkHandle:
+    """Shared, reloadable snapshot of a pristine network.
+
+    The network is serialized once in graph-tool's binary format, under
+    /dev/shm when available so the bytes stay in memory. Every load() then
+    rehydrates a fresh Graph through the C++ deserializer (all properties
+    included), which replaces both the per-heuristic network.copy() in the
+    parent and pickling the Graph object into pool workers: they can open
+    the same path instead.
+    """
+
+    def __init__(self, name: str, network, directory: Union[Path, str] = None):
+        self.name = name
+
+        if directory is None:
+            shm = Path("/dev/shm")
+            directory = shm if shm.is_dir() else Path(tempfile.gettempdir())
+
+        fd = tempfile.NamedTemporaryFile(
+            prefix=f"{name}.",
+            suffix=".gt",
+            dir=str(directory),
+            delete=False,
+        )
+        fd.close()
+
+        self.path = Path(fd.name)
+        network.save(str(self.path))
+
+    def load(self):
+        return load_graph(str(self.path))
+
+    def close(self):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_cached_network_size(file) -> Union[int, None]:
+    """Return the vertex count cached in the sidecar .size file, if any.
+
+    None means the network was never loaded (or the sidecar is unreadable):
+    callers that filter on size must then load the graph to know.
+    """
+    size_file = Path(f"{file}.size")
+
+    try:
+        return int(size_file.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def cache_network_size(file, num_vertices: int):
+    """Persist the vertex count next to the network file.
+
+    Lets future runs filter oversized networks without paying the
+    O(|V|+|E|) load; a read-only dataset directory is not an error.
+    """
+    size_file = Path(f"{file}.size")
+
+    try:
+        size_file.write_text(f"{num_vertices}\n")
+    except OSError:
+        pass
+
+
 def list_files(location, filter="*", extensions: Union[list, str] = ("graphml", "gt"), **kwargs):
     if not isinstance(filter, list):
         filter = [filter]
@@ -6,7 +6,18 @@ import numpy as np
 import pandas as pd
 
 
+def is_feather_file(file) -> bool:
+    return Path(file).suffix == ".feather"
+
+
 def get_df_columns(file: Path):
+    if is_feather_file(file):
+        # Read the schema only, not the table
+        from pyarrow import ipc, memory_map
+
+        with memory_map(str(file)) as source:
+            return ipc.open_file(source).schema.names
+
     # Read column names from file
     cols = list(pd.read_csv(str(file), nrows=1))
 
@@ -47,6 +58,26 @@ def read_without_columns(
     cols = get_df_columns(file)
     usecols = [i for i in cols if i not in exclude_columns]
 
+    if is_feather_file(file):
+        # Binary column store: the removals column round-trips as a native
+        # list, so no literal_eval pass is needed downstream
+        df = pd.read_feather(str(file), columns=usecols)
+
+        if read_index is not None:
+            if isinstance(read_index, int):
+                read_index = [read_index]
+
+            df = df.iloc[read_index]
+            df["idx"] = read_index
+            df = df.reset_index(drop=True)
+        else:
+            df["idx"] = df.index
+
+        df["file"] = f"{file}"
+        df["file"] = df["file"].astype("category")
+
+        return df
+
     indices_to_read = None
     if read_index is not None:
         if isinstance(read_index, int):
@@ -238,3 +269,17 @@ class RemovalsColumns:
     PREDICTION = 2
     LCC_SIZE = 3
     SLCC_SIZE = 4
+
+
+# Structured row matching the RemovalsColumns layout. The dismantlers fill a
+# preallocated array of these instead of appending Python tuples.
+# The float columns are float32 on purpose: LCC/SLCC ratios live in [0, 1]
+# and even a 10^8-vertex network only needs ~1e-8 resolution, so single
+# precision halves the bandwidth of the AUC/argmax/serialization passes.
+REMOVAL_DTYPE = np.dtype([
+    ("removal_num", np.int64),
+    ("id", np.int64),
+    ("prediction", np.float32),
+    ("lcc_size", np.float32),
+    ("slcc_size", np.float32),
+])
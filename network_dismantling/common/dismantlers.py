@@ -1,18 +1,428 @@
 import logging
 from functools import wraps
-from operator import itemgetter
+from heapq import heapify, heappop, heappush
 from typing import Dict, Callable, Union
 
 import numpy as np
-from graph_tool import Graph, VertexPropertyMap, GraphView
+from graph_tool import Graph, VertexPropertyMap
 from graph_tool.topology import label_components, kcore_decomposition
-from network_dismantling.common.df_helpers import RemovalsColumns
+from network_dismantling.common.df_helpers import REMOVAL_DTYPE
 from network_dismantling.common.external_dismantlers.lcc_threshold_dismantler import (
+    add_dismantling_edges,
     threshold_dismantler as external_threshold_dismantler,
 )
 from network_dismantling.dismantler import get_predictions
 from scipy.integrate import simpson
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _relabel_split_components(
+        indptr,
+        indices,
+        removed,
+        belongings,
+        component_size,
+        seeds,
+        component,
+        next_label,
+        visited,
+        group,
+        epoch,
+        queue,
+):
+    """Detect whether clearing a vertex split its component and relabel the
+    pieces it broke into. Returns the number of new components.
+
+    One BFS is started per seed (former neighbour of the cleared vertex);
+    they all expand from a shared FIFO queue, so the searches advance in
+    near lock-step and are merged -- via union-find over the seed groups --
+    as soon as their frontiers touch. If every group merges the component is
+    intact and the sweep stops right there. Otherwise the search stops once
+    at most one group is still expanding: the groups that exhausted their
+    frontier are complete pieces and get new labels, while the last one --
+    typically the largest piece -- keeps the old label without ever being
+    swept. This is the "smaller-half" bound: the cost is proportional to the
+    pieces that actually split off, not to the surviving component.
+    """
+    n_seeds = seeds.shape[0]
+
+    # Union-find over the seed groups, plus the number of vertices each
+    # (root) group still has queued.
+    parent = np.arange(n_seeds)
+    pending = np.ones(n_seeds, dtype=np.int64)
+
+    for k in range(n_seeds):
+        s = seeds[k]
+        visited[s] = epoch
+        group[s] = k
+        queue[k] = s
+
+    head = 0
+    tail = n_seeds
+
+    roots = n_seeds
+    done = 0
+
+    while head < tail and roots - done > 1:
+        u = queue[head]
+        head += 1
+
+        g = group[u]
+        while parent[g] != g:
+            g = parent[g]
+        x = group[u]
+        while parent[x] != g:
+            x_next = parent[x]
+            parent[x] = g
+            x = x_next
+
+        pending[g] -= 1
+
+        for j in range(indptr[u], indptr[u + 1]):
+            w = indices[j]
+            if removed[w]:
+                continue
+
+            if visited[w] != epoch:
+                visited[w] = epoch
+                group[w] = g
+                queue[tail] = w
+                tail += 1
+                pending[g] += 1
+                continue
+
+            h = group[w]
+            while parent[h] != h:
+                h = parent[h]
+            if h == g:
+                continue
+
+            # Two searches met: their pieces are one and the same
+            if pending[h] == 0:
+                done -= 1
+            parent[h] = g
+            pending[g] += pending[h]
+            roots -= 1
+            if roots == 1:
+                # Every seed is reachable from every other: no split
+                return 0
+
+        if pending[g] == 0:
+            done += 1
+
+    # The component did split. The group still expanding keeps the old
+    # label; with a drained queue, the first seed's group does.
+    if roots - done == 1:
+        keeper = 0
+        for k in range(n_seeds):
+            if parent[k] == k and pending[k] > 0:
+                keeper = k
+                break
+    else:
+        keeper = group[seeds[0]]
+        while parent[keeper] != keeper:
+            keeper = parent[keeper]
+
+    label_of = np.full(n_seeds, -1, dtype=np.int64)
+    new_components = 0
+    for k in range(n_seeds):
+        if parent[k] == k and k != keeper:
+            label = next_label + new_components
+            new_components += 1
+
+            label_of[k] = label
+            component_size[label] = 0
+
+    for i in range(tail):
+        w = queue[i]
+
+        r = group[w]
+        while parent[r] != r:
+            r = parent[r]
+
+        if r == keeper:
+            continue
+
+        label = label_of[r]
+        belongings[w] = label
+        component_size[label] += 1
+        component_size[component] -= 1
+
+    return new_components
+
+
+def _label_components_csr(indptr, indices, belongings):
+    """Label the connected components of a CSR adjacency with an iterative
+    BFS. belongings must be filled with -1; it is labeled in place and the
+    number of components is returned.
+    """
+    network_size = belongings.shape[0]
+    stack = np.empty(max(network_size, 1), dtype=np.int64)
+
+    n_components = 0
+    for v in range(network_size):
+        if belongings[v] >= 0:
+            continue
+
+        label = n_components
+        n_components += 1
+
+        belongings[v] = label
+        stack[0] = v
+        stack_size = 1
+        while stack_size > 0:
+            stack_size -= 1
+            u = stack[stack_size]
+            for j in range(indptr[u], indptr[u + 1]):
+                w = indices[j]
+                if belongings[w] < 0:
+                    belongings[w] = label
+                    stack[stack_size] = w
+                    stack_size += 1
+
+    return n_components
+
+
+def _decremental_kcore(indptr, indices, removed, core, v, decremented, epoch, queue):
+    """Lower the core numbers affected by the removal of vertex v.
+
+    Removing one vertex decreases each neighbourhood core number by at most
+    one, and only vertices reachable through equal-core paths can be
+    affected (Sariyuce et al.'s Traversal algorithm). Starting from v's
+    former neighbours, a vertex u is demoted when fewer than core(u) of its
+    live neighbours still have core >= core(u); a demotion from k to k - 1
+    re-checks only the core-k neighbours. removed[v] must already be set.
+
+    Returns the number of vertices whose core number dropped below 2, so
+    the caller can maintain the 2-core population without a full recount.
+    """
+    lost_two_core = 0
+
+    head = 0
+    tail = 0
+    for j in range(indptr[v], indptr[v + 1]):
+        w = indices[j]
+        if not removed[w]:
+            queue[tail] = w
+            tail += 1
+
+    while head < tail:
+        u = queue[head]
+        head += 1
+
+        if decremented[u] == epoch:
+            continue
+
+        k = core[u]
+        if k == 0:
+            continue
+
+        live_support = 0
+        for j in range(indptr[u], indptr[u + 1]):
+            w = indices[j]
+            if not removed[w] and core[w] >= k:
+                live_support += 1
+
+        if live_support >= k:
+            continue
+
+        core[u] = k - 1
+        decremented[u] = epoch
+        if k == 2:
+            lost_two_core += 1
+
+        for j in range(indptr[u], indptr[u + 1]):
+            w = indices[j]
+            if not removed[w] and core[w] == k and decremented[w] != epoch:
+                queue[tail] = w
+                tail += 1
+
+    return lost_two_core
+
+
+if njit is not None:
+    # The split/relabel BFS is the hot kernel of the Python dismantlers.
+    # Compile it when numba is around; the pure-Python versions above are the
+    # fallback and stay the reference implementation.
+    _relabel_split_components = njit(cache=True, nogil=True)(_relabel_split_components)
+    _label_components_csr = njit(cache=True, nogil=True)(_label_components_csr)
+    _decremental_kcore = njit(cache=True, nogil=True)(_decremental_kcore)
+
+
+class DecrementalConnectivity:
+    """Tracks the connected components of a network while its vertices are
+    cleared one at a time.
+
+    label_components sweeps the whole graph at every call, which makes the
+    dismantling loops O(removals * (V + E)). Clearing a vertex can only split
+    its own component, so it is enough to BFS locally from the cleared
+    vertex's neighbours and update the component sizes in place.
+    """
+
+    def __init__(self, network: Graph):
+        network_size = network.num_vertices()
+
+        # CSR copy of the adjacency (both edge directions, the networks are
+        # undirected). The BFS runs on this instead of the graph-tool object.
+        edges = network.get_edges()
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order]
+        self.indptr = np.zeros(network_size + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(sources, minlength=network_size),
+            out=self.indptr[1:],
+        )
+
+        # Label the components on the CSR copy directly; going through
+        # graph-tool here would re-run its filter machinery on a graph we
+        # have already materialized.
+        self.belongings = np.full(network_size, -1, dtype=np.int64)
+        n_components = _label_components_csr(self.indptr, self.indices, self.belongings)
+
+        counts = np.bincount(self.belongings, minlength=n_components)
+
+        # Component sizes, indexed by label. Labels are never reused, so the
+        # array is grown on demand when splits create new components.
+        self.component_size = np.zeros(max(len(counts), 1) * 2, dtype=np.int64)
+        self.component_size[: len(counts)] = counts
+        self._next_label = len(counts)
+
+        self.removed = np.zeros(network_size, dtype=bool)
+
+        # Scratch buffers for the local BFS
+        self._visited = np.full(network_size, -1, dtype=np.int64)
+        self._group = np.empty(network_size, dtype=np.int64)
+        self._queue = np.empty(max(network_size, 1), dtype=np.int64)
+        self._epoch = 0
+
+        # Lazy max-heap over the (negated) component sizes. Entries are
+        # pushed on every size change; stale ones are dropped on query.
+        self._heap = [
+            (-int(size), label)
+            for label, size in enumerate(self.component_size[: self._next_label])
+        ]
+        heapify(self._heap)
+
+        self.lcc_index = 0
+        self.lcc_size = 0
+        self.slcc_size = 0
+        self._refresh_top2()
+
+    def _ensure_label_capacity(self, new_labels):
+        required = self._next_label + new_labels
+        if required > len(self.component_size):
+            self.component_size = np.resize(
+                self.component_size,
+                max(required, 2 * len(self.component_size)),
+            )
+            self.component_size[self._next_label:] = 0
+
+    def _refresh_top2(self):
+        heap = self._heap
+        component_size = self.component_size
+
+        largest = None
+        while heap:
+            size, label = heap[0]
+            if -size == component_size[label]:
+                largest = heappop(heap)
+                break
+            heappop(heap)
+
+        if largest is None:
+            self.lcc_index = 0
+            self.lcc_size = 0
+            self.slcc_size = 0
+            return
+
+        second = None
+        while heap:
+            size, label = heap[0]
+            if -size == component_size[label]:
+                second = heap[0]
+                break
+            heappop(heap)
+
+        heappush(heap, largest)
+
+        self.lcc_index = largest[1]
+        self.lcc_size = -largest[0]
+        self.slcc_size = -second[0] if second is not None else 0
+
+    def clear_vertex(self, v):
+        """Update the component bookkeeping after vertex v has been cleared."""
+        if self.removed[v]:
+            return
+
+        component = self.belongings[v]
+
+        self.removed[v] = True
+        self.belongings[v] = -1
+        self.component_size[component] -= 1
+        heappush(self._heap, (-int(self.component_size[component]), int(component)))
+
+        # Each piece the component may split into contains at least one of
+        # the cleared vertex's former (still alive) neighbours.
+        neighbors = self.indices[self.indptr[v]: self.indptr[v + 1]]
+        neighbors = neighbors[~self.removed[neighbors]]
+        if len(neighbors) > 1:
+            # Deduplicate parallel edges
+            neighbors = np.unique(neighbors)
+
+        if len(neighbors) > 1:
+            self._ensure_label_capacity(len(neighbors))
+            self._epoch += 1
+
+            new_components = _relabel_split_components(
+                self.indptr,
+                self.indices,
+                self.removed,
+                self.belongings,
+                self.component_size,
+                neighbors,
+                component,
+                self._next_label,
+                self._visited,
+                self._group,
+                self._epoch,
+                self._queue,
+            )
+
+            if new_components > 0:
+                heappush(
+                    self._heap,
+                    (-int(self.component_size[component]), int(component)),
+                )
+                for label in range(self._next_label, self._next_label + new_components):
+                    heappush(
+                        self._heap,
+                        (-int(self.component_size[label]), label),
+                    )
+
+                self._next_label += new_components
+
+        self._refresh_top2()
+
+
+def _inverse_permutation(static_id, network_size):
+    """Invert the static_id -> dynamic_id permutation by direct scatter,
+    without materializing and gathering an int64 arange. int32 indices are
+    enough for any network that fits in memory.
+    """
+    dtype = np.int32 if network_size < 2 ** 31 else np.int64
+
+    dynamic_id = np.empty(network_size, dtype=dtype)
+    dynamic_id[static_id] = np.arange(network_size, dtype=dtype)
+
+    return dynamic_id
+
 
 def get_lcc_slcc(network):
     # Networks are undirected, and this is checked after load phase
@@ -27,10 +437,14 @@ def get_lcc_slcc(network):
         local_network_lcc_size, local_network_slcc_size = counts[0], 0
         lcc_index = 0
     else:
-        lcc_index, slcc_index = np.argpartition(np.negative(counts), 1)[:2]
-        local_network_lcc_size, local_network_slcc_size = counts[
-            [lcc_index, slcc_index]
-        ]
+        # Find the two largest sizes without negating (and copying) counts:
+        # take the max, mask it out in place, take the max again.
+        lcc_index = counts.argmax()
+        local_network_lcc_size = counts[lcc_index]
+
+        counts[lcc_index] = -1
+        local_network_slcc_size = counts.max()
+        counts[lcc_index] = local_network_lcc_size
 
     return belongings, local_network_lcc_size, local_network_slcc_size, lcc_index
 
@@ -44,48 +458,80 @@ def threshold_dismantler(
         early_stopping_removals=np.inf,
         logger=logging.getLogger("dummy"),
 ):
-    removals = []
-
     network.set_fast_edge_removal(fast=True)
 
     network_size = network.num_vertices()
 
+    # Preallocate the removals log (one spare row for the early-stopping marker)
+    removals = np.empty(network_size + 1, dtype=REMOVAL_DTYPE)
+    n_removals = 0
+
     generator_args.setdefault("logger", logger)
 
+    connectivity = DecrementalConnectivity(network)
+
+    # Bind the graph-tool methods once to avoid per-iteration attribute lookups
+    vertex = network.vertex
+    clear_vertex = network.clear_vertex
+
+    # Early-stopping AUC as a running trapezoid sum, updated in O(1) per
+    # removal instead of re-integrating the whole prefix every iteration.
+    # With the default np.inf thresholds the check can never fire, so the
+    # accumulator and the test are hoisted out of the hot loop entirely.
+    early_stopping = (early_stopping_auc < np.inf) and (
+            early_stopping_removals < np.inf
+    )
+    current_auc = 0.0
+    previous_lcc_ratio = None
+
     for i, (v_i_static, p) in enumerate(
             node_generator(network, **generator_args), start=1
     ):
         # Find the vertex in graph-tool and remove it
-        v_gt = network.vertex(v_i_static, use_index=True, add_missing=False)
+        v_gt = vertex(v_i_static, use_index=True, add_missing=False)
 
         # To improve performance, we can "clear" the vertex instead of removing it (i.e. remove all edges)
-        network.clear_vertex(v_gt)
+        clear_vertex(v_gt)
 
-        # Compute connected component sizes
-        _, local_network_lcc_size, local_network_slcc_size, _ = get_lcc_slcc(network)
+        # Update the connected component sizes (no full graph sweep)
+        connectivity.clear_vertex(v_i_static)
+        local_network_lcc_size = connectivity.lcc_size
+        local_network_slcc_size = connectivity.slcc_size
 
-        removals.append(
-            (
-                i,
-                v_i_static,
-                float(p),
-                local_network_lcc_size / network_size,
-                local_network_slcc_size / network_size,
-            )
+        lcc_ratio = local_network_lcc_size / network_size
+
+        if n_removals == len(removals):
+            removals = np.resize(removals, 2 * len(removals))
+
+        removals[n_removals] = (
+            i,
+            v_i_static,
+            p,
+            lcc_ratio,
+            local_network_slcc_size / network_size,
         )
+        n_removals += 1
 
         if local_network_lcc_size <= stop_condition:
             break
 
-        current_auc = simpson(list(map(itemgetter(3), removals)), dx=1)
-        if (i > early_stopping_removals) and (current_auc > early_stopping_auc):
-            # if current_auc > early_stopping_auc:
-            removals.append((-1, -1, -1, -1, -1))
+        if early_stopping:
+            if previous_lcc_ratio is not None:
+                current_auc += 0.5 * (previous_lcc_ratio + lcc_ratio)
+            previous_lcc_ratio = lcc_ratio
 
-            logger.debug("EARLY STOPPING")
-            break
+            if (i > early_stopping_removals) and (current_auc > early_stopping_auc):
+                # if current_auc > early_stopping_auc:
+                if n_removals == len(removals):
+                    removals = np.resize(removals, 2 * len(removals))
+
+                removals[n_removals] = (-1, -1, -1, -1, -1)
+                n_removals += 1
 
-    return removals, None, None, None
+                logger.debug("EARLY STOPPING")
+                break
+
+    return removals[:n_removals], None, None, None
 
 
 # TODO REMOVE THIS FROM THE REVIEW. IT IS NOT USED!
@@ -98,28 +544,51 @@ def kcore_lcc_threshold_dismantler(
         early_stopping_removals=np.inf,
         logger=logging.getLogger("dummy"),
 ):
-    removals = []
-
     network.set_fast_edge_removal(fast=True)
     network_size = network.num_vertices()
 
+    # Preallocate the removals log
+    removals = np.empty(network_size + 1, dtype=REMOVAL_DTYPE)
+    n_removals = 0
+
     # Init generator
     generator = node_generator(network, **generator_args)
     response = None
 
     # Get static and dynamic vertex IDs
-    static_id = network.vertex_properties["static_id"].get_array()
-    dynamic_id = np.arange(start=0, stop=network_size, dtype=np.int64)[static_id]
+    static_id = network.vertex_properties["static_id"].a
+    dynamic_id = _inverse_permutation(static_id, network_size)
 
     # Compute connected component sizes
-    (
-        belongings,
-        local_network_lcc_size,
-        local_network_slcc_size,
-        lcc_index,
-    ) = get_lcc_slcc(network)
-
+    connectivity = DecrementalConnectivity(network)
+    belongings = connectivity.belongings
+    local_network_lcc_size = connectivity.lcc_size
+    local_network_slcc_size = connectivity.slcc_size
+
+    # Bind the graph-tool methods once to avoid per-iteration attribute lookups
+    vertex = network.vertex
+    clear_vertex = network.clear_vertex
+
+    # Decompose once, then maintain the core numbers decrementally: a
+    # removal only lowers cores along equal-core paths from the removed
+    # vertex, so the O(V + E) decomposition never runs again.
     kcore: Union[VertexPropertyMap, None] = None
+    kcore = kcore_decomposition(network, vprop=kcore)
+
+    core = kcore.a.astype(np.int64)
+    two_core_count = int(np.count_nonzero(core > 1))
+
+    kcore_epoch = 0
+    kcore_decremented = np.full(network_size, -1, dtype=np.int64)
+    kcore_queue = np.empty(len(connectivity.indices) + 1, dtype=np.int64)
+
+    # Early-stopping AUC accumulator; skipped entirely when the default
+    # np.inf thresholds make the check unreachable
+    early_stopping = (early_stopping_auc < np.inf) and (
+            early_stopping_removals < np.inf
+    )
+    current_auc = 0.0
+    previous_lcc_ratio = None
 
     # Init removals counter
     i = 0
@@ -130,60 +599,78 @@ def kcore_lcc_threshold_dismantler(
         v_i_dynamic = dynamic_id[v_i_static]
 
         # assert v_i_dynamic == v_i_static
-        kcore = kcore_decomposition(network, vprop=kcore)
-
-        # Extract 2-core of the network
-        # two_core_mask = lambda v: kcore[v] > 1
-        two_core_mask = kcore.a > 1
-
-        network_view = GraphView(network, vfilt=two_core_mask)
 
         # Check if is there any node left in the 2-core
         # Otherwise go to tree-breaking
-        if network_view.num_vertices() == 0:
+        if two_core_count == 0:
             break
 
-        if (belongings[v_i_dynamic] != lcc_index) or (kcore[v_i_dynamic] < 2):
+        if (belongings[v_i_dynamic] != connectivity.lcc_index) or (core[v_i_dynamic] < 2):
             response = False
         else:
             response = True
 
-            v_gt = network.vertex(v_i_dynamic, use_index=True, add_missing=False)
+            v_gt = vertex(v_i_dynamic, use_index=True, add_missing=False)
 
-            network.clear_vertex(v_gt)
+            clear_vertex(v_gt)
 
             i += 1
 
-            # Compute connected component sizes
-            (
-                belongings,
-                local_network_lcc_size,
-                local_network_slcc_size,
-                lcc_index,
-            ) = get_lcc_slcc(network)
+            # Update the connected component sizes (no full graph sweep)
+            connectivity.clear_vertex(v_i_dynamic)
+
+            # Lower the core numbers the removal affected
+            if core[v_i_dynamic] >= 2:
+                two_core_count -= 1
+
+            kcore_epoch += 1
+            two_core_count -= _decremental_kcore(
+                connectivity.indptr,
+                connectivity.indices,
+                connectivity.removed,
+                core,
+                v_i_dynamic,
+                kcore_decremented,
+                kcore_epoch,
+                kcore_queue,
+            )
+            core[v_i_dynamic] = 0
+            local_network_lcc_size = connectivity.lcc_size
+            local_network_slcc_size = connectivity.slcc_size
 
-            removals.append(
-                (
-                    i,
-                    v_i_static,
-                    float(p),
-                    local_network_lcc_size / network_size,
-                    local_network_slcc_size / network_size,
-                )
+            lcc_ratio = local_network_lcc_size / network_size
+
+            if n_removals == len(removals):
+                removals = np.resize(removals, 2 * len(removals))
+
+            removals[n_removals] = (
+                i,
+                v_i_static,
+                p,
+                lcc_ratio,
+                local_network_slcc_size / network_size,
             )
+            n_removals += 1
+
+            # Running trapezoid AUC, updated in O(1) per removal
+            if early_stopping:
+                if previous_lcc_ratio is not None:
+                    current_auc += 0.5 * (previous_lcc_ratio + lcc_ratio)
+                previous_lcc_ratio = lcc_ratio
 
         if local_network_lcc_size <= stop_condition:
             generator.close()
             break
 
-        current_auc = simpson(list(map(itemgetter(3), removals)), dx=1)
-        if (i > early_stopping_removals) and (current_auc > early_stopping_auc):
+        if early_stopping and (i > early_stopping_removals) and (
+                current_auc > early_stopping_auc
+        ):
             # if current_auc > early_stopping_auc:
 
             # print("EARLY STOPPING")
             break
 
-    return removals, None, None, None
+    return removals[:n_removals], None, None, None
 
 
 def lcc_threshold_dismantler(
@@ -194,43 +681,109 @@ def lcc_threshold_dismantler(
         logger=logging.getLogger("dummy"),
         **kwargs
 ):
-    removals = []
-
+    """Remove the generated vertices from the LCC until it shrinks below
+    stop_condition.
+
+    The generator is driven with send(response), response being whether the
+    last candidate was removed. Besides yielding one (static_id, prediction)
+    pair per candidate, a generator may opt in to batching by yielding a
+    (static_ids, predictions) pair of arrays ranked by descending
+    prediction: the whole batch is then filtered against the current LCC in
+    one vectorized pass and consumed without a coroutine round trip per
+    skipped candidate, which is where rank-once heuristics spend most of
+    their time.
+    """
     network.set_fast_edge_removal(fast=True)
     network_size = network.num_vertices()
 
+    # Preallocate the removals log
+    removals = np.empty(network_size + 1, dtype=REMOVAL_DTYPE)
+    n_removals = 0
+
     # Init generator
     generator = node_generator(network, **generator_args)
     response = None
 
     # Get static and dynamic vertex IDs
-    static_id = network.vertex_properties["static_id"].get_array()
-    dynamic_id = np.arange(start=0, stop=network_size, dtype=np.int64)[static_id]
+    static_id = network.vertex_properties["static_id"].a
+    dynamic_id = _inverse_permutation(static_id, network_size)
 
     # Compute connected component sizes
-    (
-        belongings,
-        local_network_lcc_size,
-        local_network_slcc_size,
-        lcc_index,
-    ) = get_lcc_slcc(network)
+    connectivity = DecrementalConnectivity(network)
+    belongings = connectivity.belongings
+    local_network_lcc_size = connectivity.lcc_size
+    local_network_slcc_size = connectivity.slcc_size
+
+    # Bind the graph-tool methods once to avoid per-iteration attribute lookups
+    vertex = network.vertex
+    clear_vertex = network.clear_vertex
 
     # Init removals counter
     i = 0
     while True:
         v_i_static, p = generator.send(response)
 
+        if isinstance(v_i_static, np.ndarray):
+            # Batch of ranked candidates: drop the ones already outside the
+            # LCC in one vectorized pass, then re-check each survivor (the
+            # LCC label can move while the batch is consumed) with a plain
+            # array lookup instead of a send() per skip.
+            response = True
+
+            batch_dynamic = dynamic_id[v_i_static]
+            in_lcc = belongings[batch_dynamic] == connectivity.lcc_index
+
+            for v_s, v_i_dynamic, p_i in zip(
+                    v_i_static[in_lcc].tolist(),
+                    batch_dynamic[in_lcc].tolist(),
+                    np.asarray(p)[in_lcc].tolist(),
+            ):
+                if belongings[v_i_dynamic] != connectivity.lcc_index:
+                    continue
+
+                v_gt = vertex(v_i_dynamic, use_index=True, add_missing=False)
+
+                clear_vertex(v_gt)
+
+                i += 1
+
+                # Update the connected component sizes (no full graph sweep)
+                connectivity.clear_vertex(v_i_dynamic)
+                local_network_lcc_size = connectivity.lcc_size
+                local_network_slcc_size = connectivity.slcc_size
+
+                if n_removals == len(removals):
+                    removals = np.resize(removals, 2 * len(removals))
+
+                removals[n_removals] = (
+                    i,
+                    v_s,
+                    p_i,
+                    local_network_lcc_size / network_size,
+                    local_network_slcc_size / network_size,
+                )
+                n_removals += 1
+
+                if local_network_lcc_size <= stop_condition:
+                    break
+
+            if local_network_lcc_size <= stop_condition:
+                generator.close()
+                break
+
+            continue
+
         # Find the vertex in graph-tool and remove it
         v_i_dynamic = dynamic_id[v_i_static]
 
         # assert v_i_dynamic == v_i_static
 
-        if belongings[v_i_dynamic] != lcc_index:
+        if belongings[v_i_dynamic] != connectivity.lcc_index:
             response = False
         else:
             response = True
 
-            v_gt = network.vertex(v_i_dynamic, use_index=True, add_missing=False)
+            v_gt = vertex(v_i_dynamic, use_index=True, add_missing=False)
 
             # try:
             #     assert static_id[v_i_dynamic] == v_i_static
@@ -244,33 +797,32 @@ def lcc_threshold_dismantler(
             # dynamic_id[static_id[last_vertex]] = v_i_dynamic
             # network.remove_vertex(v_gt, fast=True)
             # last_vertex -= 1
-            network.clear_vertex(v_gt)
+            clear_vertex(v_gt)
 
             i += 1
 
-            # Compute connected component sizes
-            (
-                belongings,
-                local_network_lcc_size,
-                local_network_slcc_size,
-                lcc_index,
-            ) = get_lcc_slcc(network)
+            # Update the connected component sizes (no full graph sweep)
+            connectivity.clear_vertex(v_i_dynamic)
+            local_network_lcc_size = connectivity.lcc_size
+            local_network_slcc_size = connectivity.slcc_size
 
-            removals.append(
-                (
-                    i,
-                    v_i_static,
-                    float(p),
-                    local_network_lcc_size / network_size,
-                    local_network_slcc_size / network_size,
-                )
+            if n_removals == len(removals):
+                removals = np.resize(removals, 2 * len(removals))
+
+            removals[n_removals] = (
+                i,
+                v_i_static,
+                p,
+                local_network_lcc_size / network_size,
+                local_network_slcc_size / network_size,
             )
+            n_removals += 1
 
         if local_network_lcc_size <= stop_condition:
             generator.close()
             break
 
-    return removals, None, None, None
+    return removals[:n_removals], None, None, None
 
 
 def lcc_peak_dismantler(
@@ -280,11 +832,13 @@ def lcc_peak_dismantler(
         stop_condition: int,
         logger: Callable = logging.getLogger("dummy"),
 ):
-    removals = []
-
     network.set_fast_edge_removal(fast=True)
     network_size = network.num_vertices()
 
+    # Preallocate the removals log
+    removals = np.empty(network_size + 1, dtype=REMOVAL_DTYPE)
+    n_removals = 0
+
     # Init generator
     generator = node_generator(network, **generator_args)
     response = None
@@ -293,8 +847,8 @@ def lcc_peak_dismantler(
     i = 0
 
     # Get static and dynamic vertex IDs
-    static_id = network.vertex_properties["static_id"].get_array()
-    dynamic_id = np.arange(start=0, stop=network_size, dtype=np.int64)[static_id]
+    static_id = network.vertex_properties["static_id"].a
+    dynamic_id = _inverse_permutation(static_id, network_size)
 
     # dynamic_id = np.empty(shape=network_size, dtype=np.int64)
     # for v in network.get_vertices():
@@ -305,12 +859,14 @@ def lcc_peak_dismantler(
     last_vertex = network_size - 1
 
     # Compute connected component sizes
-    (
-        belongings,
-        local_network_lcc_size,
-        local_network_slcc_size,
-        lcc_index,
-    ) = get_lcc_slcc(network)
+    connectivity = DecrementalConnectivity(network)
+    belongings = connectivity.belongings
+    local_network_lcc_size = connectivity.lcc_size
+    local_network_slcc_size = connectivity.slcc_size
+
+    # Bind the graph-tool methods once to avoid per-iteration attribute lookups
+    vertex = network.vertex
+    clear_vertex = network.clear_vertex
 
     # Init peak SLCC value
     peak_network_slcc_size = local_network_slcc_size
@@ -321,38 +877,37 @@ def lcc_peak_dismantler(
         # Find the vertex in graph-tool and remove it
         v_i_dynamic = dynamic_id[v_i_static]
 
-        if belongings[v_i_dynamic] != lcc_index:
+        if belongings[v_i_dynamic] != connectivity.lcc_index:
             response = False
         else:
             response = True
 
-            v_gt = network.vertex(v_i_dynamic, use_index=True, add_missing=False)
+            v_gt = vertex(v_i_dynamic, use_index=True, add_missing=False)
 
             last_vertex -= 1
-            network.clear_vertex(v_gt)
+            clear_vertex(v_gt)
 
             i += 1
 
-            # Compute connected component sizes
-            (
-                belongings,
-                local_network_lcc_size,
-                local_network_slcc_size,
-                lcc_index,
-            ) = get_lcc_slcc(network)
+            # Update the connected component sizes (no full graph sweep)
+            connectivity.clear_vertex(v_i_dynamic)
+            local_network_lcc_size = connectivity.lcc_size
+            local_network_slcc_size = connectivity.slcc_size
 
             if peak_network_slcc_size < local_network_slcc_size:
                 peak_network_slcc_size = local_network_slcc_size
 
-            removals.append(
-                (
-                    i,
-                    v_i_static,
-                    float(p),
-                    local_network_lcc_size / network_size,
-                    local_network_slcc_size / network_size,
-                )
+            if n_removals == len(removals):
+                removals = np.resize(removals, 2 * len(removals))
+
+            removals[n_removals] = (
+                i,
+                v_i_static,
+                p,
+                local_network_lcc_size / network_size,
+                local_network_slcc_size / network_size,
             )
+            n_removals += 1
 
         if (peak_network_slcc_size >= local_network_lcc_size) or (
                 local_network_lcc_size <= stop_condition
@@ -361,15 +916,17 @@ def lcc_peak_dismantler(
 
     # TODO REMOVE ME
     for v, p in generator:
-        removals.append(
-            (
-                i,
-                v,
-                float(p),
-                local_network_lcc_size / network_size,
-                local_network_slcc_size / network_size,
-            )
+        if n_removals == len(removals):
+            removals = np.resize(removals, 2 * len(removals))
+
+        removals[n_removals] = (
+            i,
+            v,
+            p,
+            local_network_lcc_size / network_size,
+            local_network_slcc_size / network_size,
         )
+        n_removals += 1
 
         last_vertex -= 1
 
@@ -380,7 +937,72 @@ def lcc_peak_dismantler(
 
     generator.close()
 
-    return removals, None, None, None  # prediction_time, dismantle_time
+    return removals[:n_removals], None, None, None  # prediction_time, dismantle_time
+
+
+def dismantle_networks(
+        networks,
+        dismantling_method: Callable,
+        n_workers: int = 1,
+        mp_context=None,
+        logger=logging.getLogger("dummy"),
+        **kwargs,
+):
+    """Run a dismantling method over many networks in parallel.
+
+    The sweep over networks is embarrassingly parallel while each single run
+    is sequential Python, so the scaling comes from a process pool. On
+    platforms with fork the external dismantler cache is warmed first, so
+    every worker inherits the extracted edge lists copy-on-write instead of
+    rebuilding them per job.
+
+    networks is an iterable of (name, graph) pairs, as returned by
+    init_network_provider; the runs are returned as a dict keyed by name.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    networks = list(networks)
+
+    if n_workers <= 1:
+        return {
+            name: dismantling_method(network=network, logger=logger, **kwargs)
+            for name, network in networks
+        }
+
+    for name, network in networks:
+        try:
+            add_dismantling_edges(network.graph_properties["filename"], network)
+        except (KeyError, RuntimeError):
+            # No filename property, or no edges left: the job itself will deal with it
+            pass
+
+    if mp_context is None:
+        import multiprocessing
+
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            mp_context = multiprocessing.get_context()
+
+    runs = {}
+    with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=mp_context,
+    ) as executor:
+        futures = {
+            executor.submit(
+                dismantling_method,
+                network=network,
+                logger=logger,
+                **kwargs,
+            ): name
+            for name, network in networks
+        }
+
+        for future in as_completed(futures):
+            runs[futures[future]] = future.result()
+
+    return runs
 
 
 def enqueued(original_function=None,
@@ -449,7 +1071,10 @@ def dismantler_wrapper(
                 logger = generator_args.get("logger",
                                             logging.getLogger("dummy")
                                             )
-            logger.debug(f"Passing kwargs to dismantler: {kwargs}")
+            if logger.isEnabledFor(logging.DEBUG):
+                # kwargs can hold whole removal lists: skip the formatting
+                # unless the message will be shown
+                logger.debug(f"Passing kwargs to dismantler: {kwargs}")
 
             generator_args["sorting_function"] = function
 
@@ -464,26 +1089,34 @@ def dismantler_wrapper(
                 # **generator_args,
             )
 
-            peak_slcc = max(removals, key=itemgetter(RemovalsColumns.SLCC_SIZE))
+            # Normalize to the structured layout so the peak lookup and the
+            # AUC run as vectorized column operations instead of Python scans
+            if not isinstance(removals, np.ndarray):
+                removals = np.array(removals, dtype=REMOVAL_DTYPE)
+
             rem_num = len(removals)
 
             if rem_num > 0:
-                if removals[0][RemovalsColumns.REMOVAL_NUM] < 0:
+                if removals["removal_num"][0] < 0:
                     raise RuntimeError("First removal is just the LCC size!")
 
                 # if removals[-1][RemovalsColumns.PREDICTION] == 0:
                 #     raise RuntimeError(f"ERROR: removed more nodes than predicted!\n{removals[-1]}")
 
+            peak_slcc = removals[removals["slcc_size"].argmax()]
+
             run = {
                 # "network": name,
-                "removals": removals,
+                # Keep the stored removals as a plain list of tuples so the
+                # output (and its CSV round-trip) stays unchanged
+                "removals": removals.tolist(),
 
-                "slcc_peak_at": peak_slcc[RemovalsColumns.REMOVAL_NUM],
-                "lcc_size_at_peak": peak_slcc[RemovalsColumns.LCC_SIZE],
-                "slcc_size_at_peak": peak_slcc[RemovalsColumns.SLCC_SIZE],
+                "slcc_peak_at": int(peak_slcc["removal_num"]),
+                "lcc_size_at_peak": float(peak_slcc["lcc_size"]),
+                "slcc_size_at_peak": float(peak_slcc["slcc_size"]),
                 # "heuristic": heuristic,
                 # "static": None,
-                "r_auc": simpson(list(r[RemovalsColumns.LCC_SIZE] for r in removals), dx=1),
+                "r_auc": simpson(removals["lcc_size"], dx=1),
                 "rem_num": rem_num,
 
                 "prediction_time": prediction_time,
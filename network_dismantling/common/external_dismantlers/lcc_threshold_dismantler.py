@@ -1,11 +1,15 @@
 import logging
-from datetime import timedelta
-from time import time, perf_counter_ns
+from collections import OrderedDict
+from itertools import islice
+from threading import Lock
+from time import perf_counter_ns
 from typing import Callable, Dict
 
 from graph_tool import Graph
 import numpy as np
 
+from network_dismantling.common.df_helpers import REMOVAL_DTYPE
+
 
 # from traceback import print_tb
 
@@ -29,13 +33,41 @@ def test_network_callback(network):
     return Graph(edges)
 
 
-cache = dict()
+# LRU cache of the external (edge list) graphs, keyed by filename. The C++
+# dismantler mutates the graph it is handed (removeNode), so callers always
+# copy the cached instance; the cache only saves the edge-list extraction.
+# Bounded and locked so that threaded sweeps neither grow it without limit
+# nor race on eviction.
+cache = OrderedDict()
+_cache_lock = Lock()
+
+CACHE_MAX_SIZE = 8
 
 
 def add_dismantling_edges(filename, network):
-    cache[filename] = test_network_callback(network)
+    external_network = test_network_callback(network)
+
+    with _cache_lock:
+        cache[filename] = external_network
+        cache.move_to_end(filename)
+
+        while len(cache) > CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
+    return external_network
+
+
+def get_dismantling_edges(filename, network):
+    with _cache_lock:
+        try:
+            external_network = cache[filename]
+            cache.move_to_end(filename)
+
+            return external_network
+        except KeyError:
+            pass
 
-    return cache[filename]
+    return add_dismantling_edges(filename, network)
 
 
 # def _threshold_dismantler(network, predictions, generator_args, stop_condition, dismantler):
@@ -55,13 +87,20 @@ def _threshold_dismantler(
     predictions, prediction_time = predictor(network, **generator_args)
 
     # Get the highest predicted value
-    logger.debug(f"{network_name}: Sorting the predictions...")
-    start_time = time()
-    removal_indices = np.argsort(-predictions, kind="stable")
-
-    logger.debug(
-        f"{network_name}: Done sorting. Took {timedelta(seconds=(time() - start_time))}"
-    )
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug(f"{network_name}: Sorting the predictions...")
+    start_ns = perf_counter_ns()
+
+    # Sort ascending and walk the result backwards through a negative-stride
+    # view: no negated copy of the predictions, and quicksort beats the
+    # stable sort the negation needed to keep ties index-ordered
+    removal_indices = np.argsort(predictions)[::-1]
+
+    if debug_enabled:
+        logger.debug(
+            f"{network_name}: Done sorting. Took {(perf_counter_ns() - start_ns) / 1e9:.3f}s"
+        )
 
     removal_order = network.vertex_properties["static_id"].a[removal_indices]
     removal_order = removal_order.tolist()
@@ -69,12 +108,8 @@ def _threshold_dismantler(
     network_size = network.num_vertices()
     filename = network.graph_properties["filename"]
 
-    try:
-        external_network = cache[filename]
-    except:
-        external_network = add_dismantling_edges(filename, network)
-
-    external_network = Graph(external_network)
+    # Copy the cached graph: the C++ dismantler removes its nodes in place
+    external_network = Graph(get_dismantling_edges(filename, network))
 
     logger.debug(f"{network_name}: Invoking the external dismantler.")
     start_time = perf_counter_ns()
@@ -99,24 +134,25 @@ def _threshold_dismantler(
 
     logger.debug(f"{network_name}: External dismantler returned in {dismantle_time}s")
 
-    # predictions_dict = dict(predictions)
-    predictions_dict = dict(
-        zip(network.vertex_properties["static_id"].a.tolist(), predictions.tolist())
-    )
+    # Gather the predictions by static id with an inverse-permutation scatter
+    # instead of building (and indexing) a V-entry Python dict
+    static_id = network.vertex_properties["static_id"].a
+    predictions = np.asarray(predictions)
 
-    removals = []
-    for i, (s_id, lcc_size, slcc_size) in enumerate(raw_removals, start=1):
-        removals.append(
-            (
-                i,
-                s_id,
-                float(predictions_dict[s_id]),
-                lcc_size / network_size,
-                slcc_size / network_size,
-            )
-        )
+    pred_by_static = np.empty(network_size, dtype=predictions.dtype)
+    pred_by_static[static_id] = predictions
 
-    del predictions_dict
+    raw_removals = np.asarray(raw_removals, dtype=np.float64)
+    s_ids = raw_removals[:, 0].astype(np.int64)
+
+    removals = np.empty(len(raw_removals), dtype=REMOVAL_DTYPE)
+    removals["removal_num"] = np.arange(1, len(raw_removals) + 1)
+    removals["id"] = s_ids
+    removals["prediction"] = pred_by_static[s_ids]
+    removals["lcc_size"] = raw_removals[:, 1] / network_size
+    removals["slcc_size"] = raw_removals[:, 2] / network_size
+
+    lcc_size = int(raw_removals[-1, 1])
 
     return removals, prediction_time, dismantle_time, lcc_size
 
@@ -149,7 +185,9 @@ def threshold_dismantler(network, predictor, generator_args, stop_condition, **k
     )
 
 
-def _iterative_threshold_dismantler(network, predictor, generator_args, stop_condition):
+def _iterative_threshold_dismantler(network, predictor, generator_args, stop_condition,
+                                    batch_size=1,
+                                    ):
     from network_dismantling.common.external_dismantlers.dismantler import (
         Graph,
         thresholdDismantler,
@@ -162,23 +200,35 @@ def _iterative_threshold_dismantler(network, predictor, generator_args, stop_con
     network_name = generator_args["network_name"]
     filename = network.graph_properties["filename"]
 
-    try:
-        external_network = cache[filename]
-    except:
-        external_network = add_dismantling_edges(filename, network)
-
-    external_network = Graph(external_network)
+    # Copy the cached graph: the C++ dismantler removes its nodes in place
+    external_network = Graph(get_dismantling_edges(filename, network))
 
     start_time = perf_counter_ns()
 
+    # Pull candidates from the predictor in batches and hand each batch to
+    # the external dismantler in a single call, amortizing the C <-> Python
+    # round trip. batch_size=1 keeps the strict semantics of dynamic
+    # predictors, which expect the graph to be updated after every removal;
+    # larger batches trade that for far fewer FFI crossings.
+    candidates = predictor(network, **generator_args)
+
     removals = []
+    i = 0
     try:
-        for i, (removal_static_id, removal_value) in enumerate(
-            predictor(network, **generator_args), start=1
-        ):
-            # Get the highest predicted value
-            for s_id, lcc_size, slcc_size in thresholdDismantler(
-                external_network, [removal_static_id], stop_condition
+        while True:
+            batch = list(islice(candidates, batch_size))
+
+            if len(batch) == 0:
+                break
+
+            raw_removals = thresholdDismantler(
+                external_network,
+                [removal_static_id for removal_static_id, _ in batch],
+                stop_condition,
+            )
+
+            for (removal_static_id, removal_value), (s_id, lcc_size, slcc_size) in zip(
+                batch, raw_removals
             ):
                 assert s_id == removal_static_id
 
@@ -192,6 +242,7 @@ def _iterative_threshold_dismantler(network, predictor, generator_args, stop_con
 
                 network.clear_vertex(v_gt)
 
+                i += 1
                 removals.append(
                     (
                         i,
@@ -230,7 +281,10 @@ def _iterative_threshold_dismantler(network, predictor, generator_args, stop_con
     return removals, None, None, lcc_size
 
 
-def iterative_threshold_dismantler(network, predictor, generator_args, stop_condition):
+def iterative_threshold_dismantler(network, predictor, generator_args, stop_condition,
+                                   batch_size=1,
+                                   ):
     return _iterative_threshold_dismantler(
-        network, predictor, generator_args, stop_condition
+        network, predictor, generator_args, stop_condition,
+        batch_size=batch_size,
     )
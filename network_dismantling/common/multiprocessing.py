@@ -1,5 +1,7 @@
 import logging
 import multiprocessing
+import os
+import tempfile
 from pathlib import Path
 
 from parse import compile
@@ -8,10 +10,25 @@ from tqdm.auto import tqdm
 
 child_num_format = compile("{}-{number:d}")
 
+try:
+    import orjson
+
+    def _json_dumps(value):
+        return orjson.dumps(value).decode()
+
+except ImportError:
+    from json import dumps as _json_dumps
+
 
 def dataset_writer(queue, output_file):
+    output_file = Path(output_file)
+
+    if output_file.suffix == ".feather":
+        _feather_dataset_writer(queue, output_file)
+        return
+
     kwargs = {
-        "path_or_buf": Path(output_file),
+        "path_or_buf": output_file,
         "index": False,
         # header='column_names'
     }
@@ -23,6 +40,16 @@ def dataset_writer(queue, output_file):
             return
 
         if len(record):
+            if "removals" in record.columns:
+                # Serialize the removals as JSON instead of the DataFrame's
+                # default Python repr: the dependency reads parse JSON with
+                # orjson/json, much faster than literal_eval (the formats
+                # coincide for these numeric lists anyway)
+                record = record.assign(removals=[
+                    value if isinstance(value, str) else _json_dumps(value)
+                    for value in record["removals"]
+                ])
+
             # TODO DO NOT CHECK EVERY TIME!
             # If dataframe exists append without writing the header
             if kwargs["path_or_buf"].exists():
@@ -32,6 +59,96 @@ def dataset_writer(queue, output_file):
             record.to_csv(**kwargs)
 
 
+def _feather_dataset_writer(queue, output_file: Path):
+    """Binary (Arrow IPC / Feather v2 + zstd) sink for the runs queue.
+
+    Unlike CSV, the removals column is stored as a native list and needs no
+    literal_eval on read. The stream is kept open as an IPC writer for the
+    whole run, so each queued DataFrame is appended as a record batch
+    instead of re-reading and rewriting the accumulated runs per record.
+    The schema is pinned by the pre-existing file (whose rows are carried
+    over) or by the first batch.
+
+    The stream targets a temporary file next to the output and replaces it
+    atomically only after the IPC footer lands on clean shutdown: an IPC
+    file without its footer is unreadable, so an unclean exit must leave
+    the previous sessions' rows untouched rather than a truncated store.
+    """
+    import pyarrow as pa
+    from pyarrow import ipc
+
+    schema = None
+    carried_over = None
+
+    if output_file.exists():
+        with ipc.open_file(str(output_file)) as reader:
+            carried_over = reader.read_all()
+
+        schema = carried_over.schema
+
+    tmp_path = None
+    sink = None
+    writer = None
+    clean = False
+    try:
+        while True:
+            record = queue.get()
+
+            if record is None:
+                clean = True
+                return
+
+            if not len(record):
+                continue
+
+            if writer is None:
+                # Open the stream lazily, on the first batch: a run with
+                # nothing to write must not touch the output at all
+                if schema is None:
+                    schema = pa.Schema.from_pandas(record, preserve_index=False)
+
+                fd = tempfile.NamedTemporaryFile(
+                    prefix=f"{output_file.name}.",
+                    suffix=".tmp",
+                    dir=str(output_file.parent),
+                    delete=False,
+                )
+                fd.close()
+                tmp_path = Path(fd.name)
+
+                sink = pa.OSFile(str(tmp_path), "wb")
+                writer = ipc.new_file(
+                    sink,
+                    schema,
+                    options=ipc.IpcWriteOptions(compression="zstd"),
+                )
+
+                if carried_over is not None:
+                    writer.write_table(carried_over)
+                    carried_over = None
+
+            # Cast through the pinned schema so every batch frames identically
+            writer.write_table(
+                pa.Table.from_pandas(record, schema=schema, preserve_index=False)
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+        if sink is not None:
+            sink.close()
+
+        if tmp_path is not None:
+            if clean:
+                # Atomic swap: readers see either the old file or the new
+                # one, never a partial write
+                os.replace(tmp_path, output_file)
+            else:
+                try:
+                    tmp_path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
 def progressbar_thread(q, progressbar):
     while True:
         record = q.get()
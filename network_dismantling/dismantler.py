@@ -42,12 +42,19 @@
 #       without using text edge lists.
 
 import argparse
+import gc
 import logging
-import threading
 from ast import literal_eval
+from collections import deque
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from datetime import timedelta
-from logging.handlers import QueueHandler
-from operator import itemgetter
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from math import ceil
 from pathlib import Path
 from time import time
 from typing import Callable, Union, Dict, List
@@ -55,7 +62,6 @@ from typing import Callable, Union, Dict, List
 import numpy as np
 import pandas as pd
 from graph_tool import Graph
-from network_dismantling.common.logger import logger_thread
 from tqdm.auto import tqdm
 
 try:
@@ -68,13 +74,17 @@ except ImportError:
     cuda.is_available = lambda: False
 
 from network_dismantling.common.dataset_providers import (
+    SharedNetworkHandle,
+    cache_network_size,
     list_files,
     init_network_provider,
+    read_cached_network_size,
 )
 from network_dismantling.common.df_helpers import df_reader, RemovalsColumns
 from network_dismantling.common.multiprocessing import (
     TqdmLoggingHandler,
     dataset_writer,
+    submit,
 )
 
 # # Remove the OpenMP threads. Use data parallelism instead
@@ -85,10 +95,15 @@ from network_dismantling.common.multiprocessing import (
 
 logger = None
 
+# Per-worker cache of the last network loaded from a shared snapshot
+worker_network = None
+_worker_network_path = None
+
 
 def pool_initializer(log_queue,
                      log_level=logging.INFO,
                      lock: multiprocessing.Lock = None,
+                     shared_network_path=None,
                      ):
     global logger
 
@@ -105,6 +120,50 @@ def pool_initializer(log_queue,
 
     tqdm.set_lock(lock)
 
+    if shared_network_path is not None:
+        get_worker_network(shared_network_path)
+
+
+def get_worker_network(path):
+    """Return this worker's cached copy of the network snapshot at path.
+
+    Tasks can carry the SharedNetworkHandle path (a short string) instead of
+    a pickled Graph: the worker deserializes the network once and keeps it
+    until a task asks for a different path, so the pool stays warm across
+    the heuristics of the same network instead of paying a pickle round
+    trip per task.
+    """
+    global worker_network, _worker_network_path
+
+    path = str(path)
+    if _worker_network_path != path:
+        from network_dismantling.common.loaders import load_graph
+
+        worker_network = load_graph(path)
+        _worker_network_path = path
+
+    return worker_network
+
+
+def _run_dismantling_method(heuristic_key: str, network_path: str, **kwargs):
+    """Pool entry point running one heuristic against the shared snapshot.
+
+    The payload carries the method key and the snapshot path instead of the
+    DismantlingMethod object and the Graph: the worker resolves both locally
+    (copying its cached network, since the run consumes it).
+    """
+    from network_dismantling import dismantling_methods
+
+    dismantling_method = dismantling_methods[heuristic_key]
+
+    network = get_worker_network(network_path).copy()
+
+    return dismantling_method(
+        network=network,
+        logger=logger if logger is not None else logging.getLogger("dummy"),
+        **kwargs,
+    )
+
 
 def get_predictions(
         network: Graph,
@@ -126,40 +185,132 @@ def get_predictions(
 def check_dependencies(heuristics: List[str],
                        logger: logging.Logger = logging.getLogger("dummy"),
                        ):
-    # Reverse the list to check the dependencies in the correct order
-    # TODO cyclic dependencies are not detected
-    heuristics = heuristics[::-1]
-    for i, heuristic in enumerate(heuristics):
+    """Return the heuristics in dependency order via Kahn's algorithm.
+
+    Dependencies missing from the requested list are added to the run, as
+    before; the order itself now comes from a topological sort over the
+    depends_on edges (O(V+E) instead of repeated list scans, removals and
+    insertions), and a dependency cycle raises instead of silently
+    producing a broken order.
+    """
+    # Close the requested set over the dependencies, adding missing ones
+    enumerated = list(dict.fromkeys(heuristics))
+    selected = set(enumerated)
+
+    dependents: Dict[str, List[str]] = {}
+    in_degree: Dict[str, int] = {}
+
+    queue = deque(enumerated)
+    while queue:
+        heuristic = queue.popleft()
+
         dismantling_method: DismantlingMethod = dismantling_methods[heuristic]
         display_name: str = dismantling_method.short_name
 
-        depends_on = dismantling_method.depends_on
+        try:
+            depends_on = dismantling_method.depends_on
+        except KeyError:
+            logger.error(f"Dependency {dismantling_method._depends_on} not found for heuristic {display_name}")
+            depends_on = None
+
         logger.debug(f"Dismantling method {display_name} depends on {depends_on}")
-        if depends_on is not None:
-            if isinstance(depends_on, str):
-                depends_on = dismantling_methods.get(depends_on.key, None)
 
-                if depends_on is None:
-                    logger.error(f"Dependency {dismantling_method.depends_on} not found for heuristic {display_name}")
-                    continue
+        in_degree[heuristic] = 0 if depends_on is None else 1
+
+        if depends_on is None:
+            continue
+
+        dependents.setdefault(depends_on.key, []).append(heuristic)
 
-            if depends_on.key not in heuristics:
-                heuristics.insert(i + 1, depends_on.key)
-                logger.info(f"Added dependency {depends_on.short_name} for heuristic {display_name}")
+        if depends_on.key not in selected:
+            selected.add(depends_on.key)
+            enumerated.append(depends_on.key)
+            queue.append(depends_on.key)
 
-            elif heuristics.index(depends_on.key) < i:
-                heuristics.remove(depends_on.key)
-                heuristics.insert(i, depends_on.key)
-                logger.debug(f"Moved dependency {depends_on.short_name} for heuristic {display_name}")
+            logger.info(f"Added dependency {depends_on.short_name} for heuristic {display_name}")
 
-    # Reverse the list to run the heuristics in the correct order
-    heuristics = heuristics[::-1]
+    # Kahn's algorithm: pop ready heuristics, release their dependents
+    ready = deque(heuristic
+                  for heuristic in enumerated
+                  if in_degree[heuristic] == 0)
+
+    heuristics = []
+    while ready:
+        heuristic = ready.popleft()
+        heuristics.append(heuristic)
+
+        for dependent in dependents.get(heuristic, ()):
+            in_degree[dependent] -= 1
+
+            if in_degree[dependent] == 0:
+                ready.append(dependent)
+
+    if len(heuristics) != len(enumerated):
+        raise RuntimeError(
+            f"Cyclic dependency between heuristics: {sorted(set(enumerated) - set(heuristics))}"
+        )
 
     logger.debug(f"Final heuristics list: {heuristics}")
 
     return heuristics
 
 
+def dependency_levels(heuristics: List[str],
+                      logger: logging.Logger = logging.getLogger("dummy"),
+                      ):
+    """Split a dependency-ordered heuristic list into runnable levels.
+
+    Level 0 holds the heuristics whose dependency (if any) is not part of
+    this run, i.e., whose results must already be on disk; each later level
+    holds the heuristics that depend on an earlier one. Heuristics within a
+    level are independent of each other, so they can be submitted to the
+    pool as one batch; the level boundaries are the only synchronization
+    points.
+    """
+    level_of = {}
+    levels: List[List[str]] = []
+
+    for heuristic in heuristics:
+        depends_on = dismantling_methods[heuristic].depends_on
+
+        if (depends_on is not None) and (depends_on.key in level_of):
+            level = level_of[depends_on.key] + 1
+        else:
+            level = 0
+
+        level_of[heuristic] = level
+
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(heuristic)
+
+    logger.debug(f"Heuristic dependency levels: {levels}")
+
+    return levels
+
+
+@lru_cache(maxsize=128)
+def _read_dependency_row(file: str, idx: int, columns: tuple):
+    """Read a single results row (removals included) from file, caching it.
+
+    Several heuristics may depend on the same run, and each dependency
+    lookup used to re-open and re-parse the results file. Keyed on the
+    resolved path and row index; the cache is cleared whenever new runs are
+    appended, so it never serves stale rows.
+    """
+    return df_reader(file,
+                     expected_columns=list(columns),
+                     read_index=idx,
+                     include_removals=True,
+                     at_least_one_file=False,
+                     raise_on_missing_file=False,
+                     dtype_dict={
+                         "network": "category",
+                         "heuristic": "category",
+                     },
+                     )
+
+
 def main(args, logger=logging.getLogger("dummy")):
     from multiprocessing.managers import SyncManager
 
@@ -198,18 +349,19 @@ def main(args, logger=logging.getLogger("dummy")):
     # Create the Log Queue
     log_queue = mp_manager.Queue()
 
-    # Create and start the Logger Thread
-    lp = threading.Thread(
-        target=logger_thread,
-        args=(
-            logger,
-            log_queue,
-        ),
+    # Create and start the log listener: it drains the workers' records to
+    # this process' handlers from its own thread, off the main loop
+    log_listener = QueueListener(
+        log_queue,
+        *(logger.handlers or logging.getLogger().handlers),
+        respect_handler_level=True,
     )
-    lp.start()
+    log_listener.start()
 
-    # Create and start the Dataset Writer Thread
-    dp = threading.Thread(
+    # Create and start the Dataset Writer Process: the sink gets its own
+    # interpreter, so serializing and writing the runs does not compete
+    # with the main loop for the GIL
+    dp = mp_context.Process(
         target=dataset_writer, args=(df_queue, args.output_file), daemon=True
     )
     dp.start()
@@ -272,6 +424,28 @@ def main(args, logger=logging.getLogger("dummy")):
     # Keep only the rows with the same threshold
     df = df[df["threshold"] == args.threshold]
 
+    # Index the result rows by network once, instead of allocating a boolean
+    # mask over the whole history for every network in the loop
+    network_groups = df.groupby("network",
+                                observed=True,
+                                sort=False,
+                                ).indices
+
+    # DataFrame reprs are O(rows x cols): only format them into debug
+    # messages when something will actually show them
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    # Dependency levels of the (already ordered) heuristics: heuristics in
+    # the same level are independent of each other
+    heuristic_levels = dependency_levels(args.heuristics, logger=logger)
+
+    # Resolve the DismantlingMethod objects once, instead of re-doing the
+    # registry and attribute lookups per network and heuristic
+    resolved_levels: List[List[DismantlingMethod]] = [
+        [dismantling_methods[heuristic] for heuristic in heuristic_level]
+        for heuristic_level in heuristic_levels
+    ]
+
     # Create the pool
     with ProcessPoolExecutor(
             max_workers=args.jobs,
@@ -298,245 +472,417 @@ def main(args, logger=logging.getLogger("dummy")):
 
                 # Check if the network was already tested
                 # Get the rows of the dataframe with the same network network_name
-                # Note that the network is a categorical column
-                # Avoid .loc for performance reasons
-                network_df = df[df["network"] == network_name]
+                # via the precomputed group index (O(1) lookup, no mask)
+                network_df = df.iloc[network_groups.get(network_name, [])]
 
-                logger.debug(f"Network {network_name} has {network_df.shape[0]} rows in the dataframe\n{network_df}")
-                networks_provider: Union[Dict, None] = None
-                network_size: int = None
-                generator_args: Union[Dict, None] = None
+                # Heuristics that already have a result for this network
+                done_heuristics = set(network_df["heuristic"])
 
-                with tqdm(args.heuristics,
-                          desc="Heuristics",
-                          position=1,
-                          ) as tqdm_heuristics:
-                    # Iterate over the heuristics
-                    for heuristic in tqdm_heuristics:
-                        dismantling_method: DismantlingMethod = dismantling_methods[heuristic]
+                missing_heuristics = [heuristic
+                                      for heuristic in args.heuristics
+                                      if heuristic not in done_heuristics]
+
+                if len(missing_heuristics) == 0:
+                    # Fully cached network: skip the heuristic loop without
+                    # even listing the graph file
+                    tqdm_test_network_list.set_postfix(cached=True)
+                    continue
 
-                        logger.info(
-                            f"Running heuristic {dismantling_method.short_name} with threshold {args.threshold}")
-                        df_filtered = network_df[network_df["heuristic"] == dismantling_method.key]
+                tqdm_test_network_list.set_postfix()
 
-                        # TODO also check if all the requested metrics are present?
-                        if len(df_filtered) != 0:
-                            # Nothing to do. The network was already tested
-                            continue
+                # Size cached by a previous load: filter oversized networks
+                # without even opening the graph file
+                cached_size = read_cached_network_size(network_path)
+                if (cached_size is not None) and (cached_size > args.max_num_vertices):
+                    tqdm_test_network_list.set_postfix(skipped=True)
+                    continue
 
-                        if networks_provider is None:
-                            # Delay the network loading until the heuristic is actually run
-                            # (to avoid loading the network if it is not needed, e.g., the heuristics have been already run)
+                # Restrict the dependency levels to the heuristics that
+                # still need running
+                network_levels = [
+                    [dismantling_method
+                     for dismantling_method in resolved_level
+                     if dismantling_method.key in missing_heuristics]
+                    for resolved_level in resolved_levels
+                ]
+
+                # Runs completed in this session, not yet folded into
+                # network_df: concatenating per heuristic copies the whole
+                # frame every time, so the rows are accumulated here and
+                # folded in only when a dependency lookup needs them
+                new_rows: List[pd.DataFrame] = []
+
+                if debug_enabled:
+                    logger.debug(f"Network {network_name} has {network_df.shape[0]} rows in the dataframe\n{network_df}")
+                networks_provider: Union[Dict, None] = None
+                network_size: int = None
+                generator_args: Union[Dict, None] = None
+                network_handle: Union[SharedNetworkHandle, None] = None
+                oversized: bool = False
+
+                def store_run(dismantling_method: DismantlingMethod, run):
+                    run["network"] = network_name
+                    run["threshold"] = args.threshold
+                    # run["heuristic"] = dismantling_method.key
+
+                    if isinstance(run, pd.Series):
+                        run = run.to_dict()
+
+                    if isinstance(run, dict):
+                        logger.info(f"{dismantling_method.short_name} run info on {network_name}: "
+                                    f"{run['rem_num']} removals, AUC {run['r_auc']:.3f}")
+
+                    if isinstance(run, pd.DataFrame):
+                        logger.info(f"{dismantling_method.short_name} run(s) for {network_name}:\n"
+                                    f"{run}")
+                        runs_dataframe = run[args.output_df_columns]
+
+                    else:  # not isinstance(run, pd.DataFrame):
+                        runs_dataframe = pd.DataFrame(
+                            data=[run],
+                            columns=args.output_df_columns,
+                        )
 
-                            logger.debug(f"Loading network: {network_name}")
+                    if "file" in runs_dataframe.columns:
+                        runs_dataframe = runs_dataframe.drop(columns=["file"])
 
-                            networks_provider = init_network_provider(
-                                location=network_path.parent,
-                                filter=f"{network_name}",
-                                logger=logger,
-                            )
+                    new_rows.append(runs_dataframe)
 
-                            if len(networks_provider) == 0:
-                                logger.error(f"Network {network_name} not found!")
-                                continue
+                    if "heuristic" in runs_dataframe.columns:
+                        done_heuristics.update(runs_dataframe["heuristic"])
 
-                            elif len(networks_provider) > 1:
-                                logger.error(f"More than one network found for {network_name}!")
-                                continue
+                    df_queue.put(runs_dataframe)
 
-                            network_name, network = networks_provider[0]
+                    # The output file is about to change on disk
+                    _read_dependency_row.cache_clear()
 
-                            if network_name != network_name:
-                                logger.error(
-                                    f"Loaded network with filename {network_name} does not match the expected filename {network_name}!"
-                                )
+                with tqdm(total=len(missing_heuristics),
+                          desc="Heuristics",
+                          position=1,
+                          ) as tqdm_heuristics:
+                    # Iterate over the heuristics one dependency level at a
+                    # time: heuristics within a level are independent, so the
+                    # ones that do not drive the pool themselves are submitted
+                    # to the executor as one batch instead of one blocking
+                    # call at a time
+                    for heuristic_level in network_levels:
+                        # (method, future) pairs of this level's batch
+                        batch = []
+
+                        for dismantling_method in heuristic_level:
+                            tqdm_heuristics.update()
+
+                            depends_on = dismantling_method.depends_on
+
+                            logger.info(
+                                f"Running heuristic {dismantling_method.short_name} with threshold {args.threshold}")
+                            # TODO also check if all the requested metrics are present?
+                            if dismantling_method.key in done_heuristics:
+                                # Nothing to do. The network was already tested
                                 continue
 
-                            network_size = network.num_vertices()
+                            if networks_provider is None:
+                                # Delay the network loading until the heuristic is actually run
+                                # (to avoid loading the network if it is not needed, e.g., the heuristics have been already run)
 
-                            # Compute stop condition
-                            stop_condition = np.ceil(network_size * args.threshold)
+                                logger.debug(f"Loading network: {network_name}")
 
-                            generator_args = {
-                                "network_name": network_name,
-                                "stop_condition": int(stop_condition),
-                                "threshold": args.threshold,
-                            }
+                                networks_provider = init_network_provider(
+                                    location=network_path.parent,
+                                    filter=f"{network_name}",
+                                    logger=logger,
+                                )
 
-                        dismantling_method_kwargs = {}
+                                if len(networks_provider) == 0:
+                                    logger.error(f"Network {network_name} not found!")
+                                    continue
 
-                        if dismantling_method.depends_on is not None:
-                            # Check if the dependency was already tested
-                            df_dependency_filtered = network_df[
-                                network_df["heuristic"] == dismantling_method.depends_on.key
-                                ]
+                                elif len(networks_provider) > 1:
+                                    logger.error(f"More than one network found for {network_name}!")
+                                    continue
 
-                            if len(df_dependency_filtered) == 0:
-                                logger.error(
-                                    f"Dependency {dismantling_method.depends_on.short_name} not found "
-                                    f"for heuristic {dismantling_method.short_name}"
-                                )
-                                continue
+                                network_name, network = networks_provider[0]
 
-                            if len(df_dependency_filtered) > 1:
-                                logger.error(
-                                    f"More than one dependency {dismantling_method.depends_on.short_name} "
-                                    f"found for heuristic {dismantling_method.short_name}"
-                                )
-                                continue
+                                if network_name != network_name:
+                                    logger.error(
+                                        f"Loaded network with filename {network_name} does not match the expected filename {network_name}!"
+                                    )
+                                    continue
 
-                            # Get the removals from the dependency
-                            df_dependency_filtered = df_dependency_filtered.iloc[0]
+                                network_size = network.num_vertices()
 
-                            logger.debug(f"df_dependency_filtered: {df_dependency_filtered}")
-                            if ("removals" not in df_dependency_filtered or # missing column
-                                    df_dependency_filtered["removals"] is None or # None
-                                    df_dependency_filtered["removals"] == "" or # empty string
-                                    df_dependency_filtered["removals"] == "[]" or # empty list
-                                    not isinstance(df_dependency_filtered["removals"], list) or # not a list
-                                    len(df_dependency_filtered["removals"]) == 0 # empty list
-                            ):
+                                # Remember the size so future runs can skip
+                                # this network without loading it
+                                cache_network_size(network_path, network_size)
 
+                                if network_size > args.max_num_vertices:
+                                    logger.info(
+                                        f"Network {network_name} is too large "
+                                        f"({network_size} > {args.max_num_vertices} vertices). Skipping."
+                                    )
+                                    oversized = True
+                                    break
+
+                                # Snapshot the pristine network (in shared memory
+                                # when available): each heuristic rehydrates its
+                                # own copy from it instead of copying the parent's
+                                network_handle = SharedNetworkHandle(network_name,
+                                                                     network,
+                                                                     )
+
+                                # Compute stop condition (native int: no 0-d
+                                # ndarray to allocate and unbox per heuristic)
+                                stop_condition = ceil(network_size * args.threshold)
+
+                                generator_args = {
+                                    "network_name": network_name,
+                                    "stop_condition": stop_condition,
+                                    "threshold": args.threshold,
+                                    # Workers resolve this via get_worker_network
+                                    # instead of receiving a pickled Graph
+                                    "network_path": str(network_handle.path),
+                                }
+
+                                # The parent only needed the vertex count and
+                                # the snapshot: drop its copy of the graph so
+                                # the resident set does not accumulate across
+                                # networks (runs rehydrate from the snapshot)
+                                del network
+                                networks_provider = []
+
+                            if depends_on is not None:
+                                if new_rows:
+                                    # Fold the pending runs in, once: the
+                                    # dependency may have run this session
+                                    network_df = pd.concat([network_df, *new_rows],
+                                                           ignore_index=True,
+                                                           copy=False,
+                                                           )
+                                    new_rows.clear()
+
+                                # Check if the dependency was already tested.
+                                # Compare the category codes (small ints)
+                                # instead of going through string equality;
+                                # the network column never needs a mask at
+                                # all thanks to the groupby index above
+                                heuristic_column = network_df["heuristic"]
                                 try:
-                                    df_dependency_row = df_reader(df_dependency_filtered["file"],
-                                                                  expected_columns=args.output_df_columns,
-                                                                  read_index=int(df_dependency_filtered["idx"]),
-                                                                  include_removals=True,
-                                                                  **reader_kwargs,
-                                                                  )
-                                except Exception as e:
+                                    code = heuristic_column.cat.categories.get_loc(depends_on.key)
+                                except AttributeError:
+                                    # Folding in this session's runs may have
+                                    # downgraded the column to plain object
+                                    mask = heuristic_column == depends_on.key
+                                except KeyError:
+                                    # Not among the categories: no match
+                                    mask = np.zeros(len(network_df), dtype=bool)
+                                else:
+                                    mask = heuristic_column.cat.codes.values == code
+
+                                df_dependency_filtered = network_df[mask]
+
+                                if len(df_dependency_filtered) == 0:
                                     logger.error(
-                                        f"Error while reading the dependency {dismantling_method.depends_on.display_name} "
-                                        f"for heuristic {dismantling_method.display_name} from file {df_dependency_filtered['file']}:\n"
-                                        f"{e}",
-                                        exc_info=True,
+                                        f"Dependency {depends_on.short_name} not found "
+                                        f"for heuristic {dismantling_method.short_name}"
                                     )
                                     continue
 
-                                if (df_dependency_row.shape[0] != 1):
+                                if len(df_dependency_filtered) > 1:
                                     logger.error(
-                                        f"Dependency {dismantling_method.depends_on.short_name} not found "
-                                        f"for heuristic {dismantling_method.short_name}"
+                                        f"More than one dependency {depends_on.short_name} "
+                                        f"found for heuristic {dismantling_method.short_name}"
                                     )
                                     continue
 
-                                dependency_run = df_dependency_row.iloc[0]
+                                # Get the removals from the dependency
+                                df_dependency_filtered = df_dependency_filtered.iloc[0]
+
+                                if debug_enabled:
+                                    logger.debug(f"df_dependency_filtered: {df_dependency_filtered}")
+                                if ("removals" not in df_dependency_filtered or # missing column
+                                        df_dependency_filtered["removals"] is None or # None
+                                        df_dependency_filtered["removals"] == "" or # empty string
+                                        df_dependency_filtered["removals"] == "[]" or # empty list
+                                        not isinstance(df_dependency_filtered["removals"], list) or # not a list
+                                        len(df_dependency_filtered["removals"]) == 0 # empty list
+                                ):
+
+                                    try:
+                                        df_dependency_row = _read_dependency_row(
+                                            str(df_dependency_filtered["file"]),
+                                            int(df_dependency_filtered["idx"]),
+                                            tuple(args.output_df_columns),
+                                        )
+                                    except Exception as e:
+                                        logger.error(
+                                            f"Error while reading the dependency {depends_on.display_name} "
+                                            f"for heuristic {dismantling_method.display_name} from file {df_dependency_filtered['file']}:\n"
+                                            f"{e}",
+                                            exc_info=True,
+                                        )
+                                        continue
+
+                                    if (df_dependency_row.shape[0] != 1):
+                                        logger.error(
+                                            f"Dependency {depends_on.short_name} not found "
+                                            f"for heuristic {dismantling_method.short_name}"
+                                        )
+                                        continue
+
+                                    dependency_run = df_dependency_row.iloc[0]
+
+                                    dependency_removals = dependency_run.pop("removals")
+
+                                    # logger.debug(f"Dependency run: {dependency_run}")
+                                    # logger.debug(f"Dependency df_dependency_filtered: {df_dependency_filtered}")
+                                    # logger.debug(f"Dependency removals: {dependency_removals}")
+
+                                    # Cheap sanity check on the selector
+                                    # fields only: the element-wise .equals
+                                    # traversal of the whole row is paid just
+                                    # when debugging
+                                    mismatch = any(
+                                        df_dependency_filtered[column] != dependency_run[column]
+                                        for column in ("network", "heuristic", "threshold", "idx")
+                                    )
 
-                                dependency_removals = dependency_run.pop("removals")
+                                    if (not mismatch) and logger.isEnabledFor(logging.DEBUG):
+                                        mismatch = not df_dependency_filtered.equals(dependency_run)
+
+                                    if mismatch:
+                                        logger.error(
+                                            f"Dependency {depends_on.short_name} mismatch "
+                                            f"for heuristic {dismantling_method.short_name}:\n"
+                                            f"Original:\n{df_dependency_filtered}\n"
+                                            f"Read:\n{dependency_run}"
+                                        )
+                                        continue
+
+                                    if debug_enabled:
+                                        logger.debug(f"Dependency {depends_on.display_name} "
+                                                     f"found for heuristic {dismantling_method.display_name}:\n"
+                                                     f"{df_dependency_filtered}")
+                                else:
+                                    dependency_removals = df_dependency_filtered["removals"]
+
+                                if dependency_removals is None:
+                                    logger.error(
+                                        f"Dependency {depends_on.short_name} not found "
+                                        f"for heuristic {dismantling_method.short_name}"
+                                    )
+                                    continue
 
-                                # logger.debug(f"Dependency run: {dependency_run}")
-                                # logger.debug(f"Dependency df_dependency_filtered: {df_dependency_filtered}")
-                                # logger.debug(f"Dependency removals: {dependency_removals}")
+                                try:
 
-                                if not df_dependency_filtered.equals(dependency_run):
+                                    if isinstance(dependency_removals, str):
+                                        try:
+                                            dependency_removals = json_loads(dependency_removals)
+                                        except ValueError:
+                                            # Rows written before the JSON
+                                            # switch use the Python repr
+                                            dependency_removals = literal_eval(dependency_removals)
+
+                                    # Slice the ID column out in one C-level pass
+                                    # instead of an itemgetter call per removal
+                                    dependency_removals = np.asarray(
+                                        dependency_removals,
+                                        dtype=np.float64,
+                                    )[:, RemovalsColumns.ID].astype(np.int64)
+                                except Exception as e:
                                     logger.error(
-                                        f"Dependency {dismantling_method.depends_on.short_name} mismatch "
+                                        f"Error while parsing the removals for the dependency {depends_on.short_name} "
                                         f"for heuristic {dismantling_method.short_name}:\n"
-                                        f"Original:\n{df_dependency_filtered}\n"
-                                        f"Read:\n{dependency_run}"
+                                        f"{e}"
+                                        f"Dependency removals: {dependency_removals}",
+                                        exc_info=True,
                                     )
                                     continue
 
-                                logger.debug(f"Dependency {dismantling_method.depends_on.display_name} "
-                                             f"found for heuristic {dismantling_method.display_name}:\n"
-                                             f"{df_dependency_filtered}")
-                            else:
-                                dependency_removals = df_dependency_filtered["removals"]
+                                # generator_args is the one carrier: the
+                                # wrapped heuristics receive its content
+                                # through the sorting function call, so a
+                                # second copy in the direct kwargs would just
+                                # double the pickled payload
+                                generator_args[depends_on.key] = dependency_removals
+
+                            logger.debug(
+                                f"Dismantling {network_name} according to {dismantling_method.short_name}. "
+                                f"Aiming to LCC size {stop_condition} ({stop_condition / network_size:.3f})"
+                            )
+
+                            if (args.jobs > 1) and (not dismantling_method.uses_executor):
+                                # Ship the run to the pool. The payload
+                                # carries the snapshot path, not the Graph;
+                                # generator_args is copied so later dependency
+                                # entries cannot race a pending future
+                                batch.append((
+                                    dismantling_method,
+                                    submit(executor,
+                                           _run_dismantling_method,
+                                           dismantling_method.key,
+                                           generator_args["network_path"],
+                                           threshold=args.threshold,
+                                           stop_condition=stop_condition,
+                                           generator_args=dict(generator_args),
+                                           pool_size=1,
+                                           ),
+                                ))
 
-                            if dependency_removals is None:
-                                logger.error(
-                                    f"Dependency {dismantling_method.depends_on.short_name} not found "
-                                    f"for heuristic {dismantling_method.short_name}"
-                                )
                                 continue
 
+                            # Pool-driving methods (and single-job runs)
+                            # execute in the parent, as before; the pool
+                            # handles travel as direct kwargs only
                             try:
+                                run = dismantling_method(
+                                    network=network_handle.load(),
+                                    threshold=args.threshold,
 
-                                if isinstance(dependency_removals, str):
-                                    dependency_removals = literal_eval(dependency_removals)
+                                    stop_condition=stop_condition,
+                                    generator_args=generator_args,
 
-                                dependency_removals = list(map(itemgetter(RemovalsColumns.ID), dependency_removals))
+                                    executor=executor,
+                                    pool_size=args.jobs,
+                                    mp_manager=mp_manager,
+                                    logger=logger,
+                                )
                             except Exception as e:
-                                logger.error(
-                                    f"Error while parsing the removals for the dependency {dismantling_method.depends_on.short_name} "
-                                    f"for heuristic {dismantling_method.short_name}:\n"
-                                    f"{e}"
-                                    f"Dependency removals: {dependency_removals}",
+                                logger.exception(
+                                    f"Error while dismantling network {network_name} with {dismantling_method.short_name}:\n"
+                                    f"{e}",
                                     exc_info=True,
                                 )
-                                continue
-
-                            dismantling_method_kwargs[dismantling_method.depends_on.key] = dependency_removals
-                            generator_args[dismantling_method.depends_on.key] = dependency_removals
 
-                        logger.debug(
-                            f"Dismantling {network_name} according to {display_name}. "
-                            f"Aiming to LCC size {stop_condition} ({stop_condition / network_size:.3f})"
-                        )
-                        
-                        if network_size > args.max_num_vertices:
-                            continue
-                        # logger.debug(f"dismantling_method_kwargs: {dismantling_method_kwargs}")
-
-                        generator_args["executor"] = executor
-                        generator_args["pool_size"] = args.jobs
-                        generator_args["mp_manager"] = mp_manager
-
-                        try:
-                            # TODO REMOVE THE COPY OF THE NETWORK, and move where its actually needed
-                            run = dismantling_method(
-                                network=network.copy(),
-                                threshold=args.threshold,
-
-                                stop_condition=stop_condition,
-                                generator_args=generator_args,
-                                **dismantling_method_kwargs,
-
-                                executor=executor,
-                                pool_size=args.jobs,
-                                mp_manager=mp_manager,
-                                logger=logger,
-                            )
-
-                            run["network"] = network_name
-                            run["threshold"] = args.threshold
-                            # run["heuristic"] = dismantling_method.key
-
-                            if isinstance(run, pd.Series):
-                                run = run.to_dict()
-
-                            if isinstance(run, dict):
-                                logger.info(f"{dismantling_method.short_name} run info on {network_name}: "
-                                            f"{run['rem_num']} removals, AUC {run['r_auc']:.3f}")
+                                continue
 
-                            if isinstance(run, pd.DataFrame):
-                                logger.info(f"{dismantling_method.short_name} run(s) for {network_name}:\n"
-                                            f"{run}")
-                                runs_dataframe = run[args.output_df_columns]
+                            store_run(dismantling_method, run)
 
-                            else:  # not isinstance(run, pd.DataFrame):
-                                runs_dataframe = pd.DataFrame(
-                                    data=[run],
-                                    columns=args.output_df_columns,
+                        # Level barrier: collect the batched runs before the
+                        # next level, whose heuristics may depend on them
+                        for dismantling_method, future in batch:
+                            try:
+                                run = future.result()
+                            except Exception as e:
+                                logger.exception(
+                                    f"Error while dismantling network {network_name} with {dismantling_method.short_name}:\n"
+                                    f"{e}",
+                                    exc_info=True,
                                 )
 
-                            if "file" in runs_dataframe.columns:
-                                runs_dataframe = runs_dataframe.drop(columns=["file"])
+                                continue
+
+                            store_run(dismantling_method, run)
 
-                            # Update the dataframe with the new run(s)
-                            network_df = pd.concat([network_df, runs_dataframe],
-                                                   ignore_index=True,
-                                                   )
-                            df_queue.put(runs_dataframe)
+                        if oversized:
+                            # No heuristic can run on this network
+                            break
 
-                        except Exception as e:
-                            logger.exception(
-                                f"Error while dismantling network {network_name} with {dismantling_method.short_name}:\n"
-                                f"{e}",
-                                exc_info=True,
-                            )
+                if network_handle is not None:
+                    network_handle.close()
 
-                            continue
+                    # The rehydrated graphs and per-network frames can be
+                    # sizeable: reclaim them before the next network
+                    gc.collect()
 
         # Close the pool
         executor.shutdown(
@@ -544,10 +890,11 @@ def main(args, logger=logging.getLogger("dummy")):
             cancel_futures=False,
         )
     df_queue.put(None)
-    log_queue.put(None)
 
     dp.join()
-    lp.join()
+
+    # Sends its own sentinel and joins the listener thread
+    log_listener.stop()
 
 
 def get_df_columns():
@@ -12,7 +12,7 @@ from scipy.integrate import simpson
 from tqdm.auto import tqdm
 
 from network_dismantling.common.dataset_providers import list_files, init_network_provider
-from network_dismantling.common.df_helpers import df_reader
+from network_dismantling.common.df_helpers import REMOVAL_DTYPE, df_reader
 from network_dismantling.common.dismantlers import threshold_dismantler
 from network_dismantling.common.external_dismantlers.lcc_threshold_dismantler import \
     threshold_dismantler as external_threshold_dismantler
@@ -230,17 +230,21 @@ def main(args):
                                                                        stop_condition=stop_condition,
                                                                        )
 
-                peak_slcc = max(removals, key=itemgetter(4))
+                if not isinstance(removals, np.ndarray):
+                    removals = np.array(removals, dtype=REMOVAL_DTYPE)
+
+                # Work on the (contiguous) columns instead of per-row tuples
+                peak_slcc = removals[removals["slcc_size"].argmax()]
 
                 run = {
                     "network": name,
-                    "removals": removals,
-                    "slcc_peak_at": peak_slcc[0],
-                    "lcc_size_at_peak": peak_slcc[3],
-                    "slcc_size_at_peak": peak_slcc[4],
+                    "removals": removals.tolist(),
+                    "slcc_peak_at": int(peak_slcc["removal_num"]),
+                    "lcc_size_at_peak": float(peak_slcc["lcc_size"]),
+                    "slcc_size_at_peak": float(peak_slcc["slcc_size"]),
                     "heuristic": heuristic,
                     "static": mode,
-                    "r_auc": simpson(list(r[3] for r in removals), dx=1)
+                    "r_auc": simpson(removals["lcc_size"], dx=1)
                 }
 
                 runs.append(run)
@@ -343,7 +343,7 @@ def main(
 
                 _run = {
                     "network": network_name,
-                    "removals": removals,
+                    "removals": removals.tolist() if isinstance(removals, np.ndarray) else removals,
                     "slcc_peak_at": peak_slcc[0],
                     "lcc_size_at_peak": peak_slcc[3],
                     "slcc_size_at_peak": peak_slcc[4],